@@ -0,0 +1,60 @@
+import os
+import threading
+
+class Backend:
+    """
+    Builds the database, NLP engine, recommender and render cache on a
+    background thread so the entry points can show their prompt or window
+    immediately.
+    The heavy modules are only imported by that thread.
+    """
+
+    def __init__(self, data_path=None):
+        if data_path is None:
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            data_path = os.path.join(base_dir, 'data', 'materials.json')
+        self.data_path = data_path
+        self.db = None
+        self.nlp = None
+        self.recommender = None
+        self.render = None
+        self.error = None
+        self._ready = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Starts loading in the background. Safe to call more than once."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._load, name="backend-loader", daemon=True)
+            self._thread.start()
+        return self
+
+    def _load(self):
+        try:
+            from src.database import MaterialDatabase, resolve_data_path
+            from src.nlp_engine import NLPEngine
+            from src.recommender import Recommender
+            from src.render import RenderCache
+
+            self.db = MaterialDatabase(resolve_data_path(self.data_path))
+            # Touching the property builds the full-text index now, off the UI
+            # thread (for a snapshot it only wraps the stored postings)
+            self.db.text_index
+            self.nlp = NLPEngine()
+            self.recommender = Recommender(self.db)
+            self.render = RenderCache(self.db)
+        except Exception as e:
+            self.error = e
+        finally:
+            self._ready.set()
+
+    def is_ready(self):
+        return self._ready.is_set()
+
+    def wait(self):
+        """Blocks until loading finished. Re-raises any loading error."""
+        self.start()
+        self._ready.wait()
+        if self.error is not None:
+            raise self.error
+        return self
@@ -0,0 +1,81 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Startup-time benchmark for the CLI.
+# Measures wall clock from process launch until the first answer to a query
+# is printed, and lists the slowest imports reported by `-X importtime`.
+#
+# Usage: python src/bench_startup.py [runs] [budget_seconds]
+# Exits with status 1 when the median time to first answer exceeds the budget.
+
+BUDGET_SECONDS = 0.3
+QUERY = "lightweight, low cost"
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_PATH = os.path.join(BASE_DIR, 'src', 'main.py')
+
+
+def time_to_first_answer(extra_args=()):
+    """Runs the CLI once and returns (seconds to first answer, stderr)."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, *extra_args, MAIN_PATH],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        text=True, bufsize=1,
+        env={**os.environ, 'PYTHONUNBUFFERED': '1'},
+    )
+    proc.stdin.write(QUERY + "\nexit\n")
+    proc.stdin.flush()
+
+    elapsed = None
+    for line in proc.stdout:
+        if elapsed is None and "Bot:" in line:
+            elapsed = time.perf_counter() - start
+    _, stderr = proc.communicate()
+    if elapsed is None:
+        raise RuntimeError(f"CLI produced no answer:\n{stderr}")
+    return elapsed, stderr
+
+
+def import_breakdown(limit=15):
+    """Returns the slowest (cumulative_us, self_us, module) import entries."""
+    _, stderr = time_to_first_answer(('-X', 'importtime'))
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), module.strip()))
+    rows.sort(reverse=True)
+    return rows[:limit]
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else BUDGET_SECONDS
+
+    timings = [time_to_first_answer()[0] for _ in range(runs)]
+    median = statistics.median(timings)
+
+    print(f"Time to first answer over {runs} runs:")
+    print(f"  min    : {min(timings) * 1000:8.1f} ms")
+    print(f"  median : {median * 1000:8.1f} ms")
+    print(f"  max    : {max(timings) * 1000:8.1f} ms")
+    print(f"  budget : {budget * 1000:8.1f} ms")
+
+    print("\nSlowest imports (-X importtime):")
+    print(f"  {'cumulative'.rjust(10)} {'self'.rjust(10)}  module")
+    for cumulative_us, self_us, module in import_breakdown():
+        print(f"  {cumulative_us / 1000:8.1f}ms {self_us / 1000:8.1f}ms  {module}")
+
+    if median > budget:
+        print(f"\nFAIL: median {median * 1000:.1f} ms exceeds budget of {budget * 1000:.1f} ms")
+        sys.exit(1)
+    print("\nOK: within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,80 @@
 import json
 import os
 
+from src.snapshot import Snapshot, SnapshotMaterials, SnapshotTextIndex, is_snapshot, snapshot_path_for
+from src.text_index import TextIndex
+
+def resolve_data_path(json_path):
+    """
+    Prefers the binary snapshot next to the JSON catalogue when it exists,
+    opens cleanly and is not older than the JSON file.
+    """
+    snap_path = snapshot_path_for(json_path)
+    if os.path.exists(snap_path):
+        if not os.path.exists(json_path) or os.path.getmtime(snap_path) >= os.path.getmtime(json_path):
+            # Fall back to the JSON if the snapshot is truncated or from another version
+            try:
+                Snapshot(snap_path).close()
+            except (OSError, ValueError):
+                if os.path.exists(json_path):
+                    return json_path
+            return snap_path
+    return json_path
+
 class MaterialDatabase:
     def __init__(self, data_path):
         self.data_path = data_path
+        self.snapshot = None
+        # Bumped on every reload so derived caches can tell they are stale
+        self.version = 0
+        self.materials = self._load_data()
+        self._text_index = None
+
+    def reload(self):
+        """Re-reads the catalogue from disk and invalidates derived caches."""
+        old_snapshot = self.snapshot
+        self.snapshot = None
         self.materials = self._load_data()
+        self._text_index = None
+        self.version += 1
+        if old_snapshot is not None:
+            old_snapshot.close()
 
     def _load_data(self):
-        """Loads materials from the JSON file."""
+        """Loads materials from the JSON file or a binary snapshot."""
         if not os.path.exists(self.data_path):
             raise FileNotFoundError(f"Database file not found at {self.data_path}")
-        
+
+        if is_snapshot(self.data_path):
+            self.snapshot = Snapshot(self.data_path)
+            return SnapshotMaterials(self.snapshot)
+
         with open(self.data_path, 'r', encoding='utf-8') as f:
             return json.load(f)
 
+    @property
+    def text_index(self):
+        """
+        Full-text index over names, descriptions and applications.
+        Snapshots carry it prebuilt; for JSON it is built on first use (the
+        backend loader warms it) and rebuilt after a reload.
+        """
+        if self._text_index is None:
+            if self.snapshot is not None:
+                self._text_index = SnapshotTextIndex(self.snapshot)
+            else:
+                self._text_index = TextIndex(self.materials)
+        return self._text_index
+
     def get_all_materials(self):
         """Returns the list of all materials."""
         return self.materials
 
     def get_material_by_name(self, name):
         """Finds a material by its name."""
+        if self.snapshot is not None:
+            row = self.snapshot.find_name(name)
+            return None if row is None else self.materials[row]
         for mat in self.materials:
             if mat['name'].lower() == name.lower():
                 return mat
@@ -1,6 +1,11 @@
 import json
 import random
 import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.snapshot import write_snapshot, snapshot_path_for
 
 def get_base_properties(mat_type):
     # Returns base properties and ranges for different families
@@ -272,3 +277,7 @@ if __name__ == "__main__":
     with open(out_path, 'w') as f:
         json.dump(mats, f, indent=2)
     print(f"Saved to {out_path}")
+
+    snap_path = snapshot_path_for(out_path)
+    write_snapshot(mats, snap_path)
+    print(f"Saved snapshot to {snap_path}")
@@ -1,38 +1,48 @@
 import tkinter as tk
-from tkinter import ttk, font, scrolledtext
+from tkinter import ttk, font, scrolledtext, messagebox
 import sys
 import os
 
 # Ensure we can import from src
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from src.database import MaterialDatabase
-from src.nlp_engine import NLPEngine
-from src.recommender import Recommender
+from src.backend import Backend
 
 class MaterialChatbotGUI:
-    def __init__(self, master):
+    def __init__(self, master, backend=None):
         self.master = master
         master.title("Material Selection Assistant - Pro")
         master.geometry("1000x700")
         
-        # Initialize Backend
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        data_path = os.path.join(base_dir, 'data', 'materials.json')
-        
+        # Initialize Backend in the background so the window shows immediately
+        self.backend = (backend or Backend()).start()
+        self.db = None
+        self.nlp = None
+        self.recommender = None
+        self.render = None
+
+        self._configure_styles()
+        self._setup_layout()
+        self._display_welcome()
+        self._poll_backend()
+
+    def _poll_backend(self):
+        if not self.backend.is_ready():
+            self.master.after(50, self._poll_backend)
+            return
+
         try:
-            self.db = MaterialDatabase(data_path)
-            self.nlp = NLPEngine()
-            self.recommender = Recommender(self.db)
+            self.backend.wait()
         except Exception as e:
-            tk.messagebox.showerror("Error", f"Failed to initialize backend: {e}")
-            master.destroy()
+            messagebox.showerror("Error", f"Failed to initialize backend: {e}")
+            self.master.destroy()
             return
 
-        self._configure_styles()
-        self._setup_layout()
+        self.db = self.backend.db
+        self.nlp = self.backend.nlp
+        self.recommender = self.backend.recommender
+        self.render = self.backend.render
         self._populate_material_list()
-        self._display_welcome()
 
     def _configure_styles(self):
         self.style = ttk.Style()
@@ -167,12 +177,8 @@ class MaterialChatbotGUI:
     def show_material_details(self, mat):
         self.details_text.config(state='normal')
         self.details_text.delete(1.0, tk.END)
-        self.details_text.insert(tk.END, f"{mat['name']}\n", "bold")
-        self.details_text.insert(tk.END, f"Type: {mat['type']}\n\n")
-        self.details_text.insert(tk.END, "Properties:\n")
-        for k, v in mat['properties'].items():
-            self.details_text.insert(tk.END, f"- {k}: {v}\n")
-        self.details_text.insert(tk.END, f"\nDesc: {mat['description']}\n")
+        # Cached block, inserted with a single Tk call
+        self.details_text.insert(tk.END, *self.render.detail_segments(mat))
         self.details_text.config(state='disabled')
 
     def _append_message(self, sender, message, tag):
@@ -185,22 +191,26 @@ class MaterialChatbotGUI:
         query = self.user_input.get().strip()
         if not query:
             return
+        if self.nlp is None:
+            self._append_message("Bot", "Still loading the material library, please try again in a moment.", "error")
+            return
         
         self.user_input.delete(0, tk.END)
         self._append_message("You", query, "user")
         
         constraints = self.nlp.process_query(query)
-        if not constraints:
+        # Free text is also matched against names, descriptions and applications
+        results = self.recommender.recommend(constraints, self.nlp.free_text(query))
+        if not constraints and not results:
             self._append_message("Bot", "I couldn't identify specific properties. Try 'strong', 'light', 'cheap'.", "error")
             return
         
         # Feedback on detection
-        self.chat_area.configure(state='normal')
-        det_str = ", ".join([f"{k}={v}" for k,v in constraints.items()])
-        self.chat_area.insert(tk.END, f"   [Searching for: {det_str}]\n", "bot")
-        self.chat_area.configure(state='disabled')
-
-        results = self.recommender.recommend(constraints)
+        if constraints:
+            self.chat_area.configure(state='normal')
+            det_str = ", ".join([f"{k}={v}" for k,v in constraints.items()])
+            self.chat_area.insert(tk.END, f"   [Searching for: {det_str}]\n", "bot")
+            self.chat_area.configure(state='disabled')
         
         if results:
             top = results[0]
@@ -210,15 +220,15 @@ class MaterialChatbotGUI:
             self._select_material_in_list(mat['name'])
             
             # Show in Chat
+            # Build the whole reply first and insert it in one batched call
+            reasons = "".join(f"     • {reason}\n" for reason in top['reasons'])
             self.chat_area.configure(state='normal')
-            self.chat_area.insert(tk.END, "\nBot: I recommend ", "bot")
-            self.chat_area.insert(tk.END, mat['name'] + "\n", "title")
-            
-            self.chat_area.insert(tk.END, "     Why?\n", "bot")
-            for reason in top['reasons']:
-                self.chat_area.insert(tk.END, f"     • {reason}\n", "bot")
-            
-            self.chat_area.insert(tk.END, "\n", "bot")
+            self.chat_area.insert(
+                tk.END,
+                "\nBot: I recommend ", "bot",
+                mat['name'] + "\n", "title",
+                "     Why?\n" + reasons + "\n", "bot",
+            )
             self.chat_area.configure(state='disabled')
             self.chat_area.see(tk.END)
         else:
@@ -243,9 +253,11 @@ class MaterialChatbotGUI:
         self._append_message("Bot", "Welcome! I can help you select materials.\nType requirements like 'lightweight, strong' in the box below.\nOr browse the library on the right.", "bot")
 
 def main():
+    # Start loading before Tk initialises so both overlap
+    backend = Backend().start()
     root = tk.Tk()
     # Optional: Set icon if available, skipped for now
-    app = MaterialChatbotGUI(root)
+    app = MaterialChatbotGUI(root, backend)
     root.mainloop()
 
 if __name__ == "__main__":
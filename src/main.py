@@ -4,24 +4,12 @@ import os
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from src.database import MaterialDatabase
-from src.nlp_engine import NLPEngine
-from src.recommender import Recommender
+from src.backend import Backend
 
 def main():
     
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    data_path = os.path.join(base_dir, 'data', 'materials.json')
-
-    
-    try:
-        db = MaterialDatabase(data_path)
-    except Exception as e:
-        print(f"Error loading database: {e}")
-        return
-
-    nlp = NLPEngine()
-    recommender = Recommender(db)
+    # Load the catalogue in the background while the banner is shown
+    backend = Backend().start()
 
     print("=====================================================")
     print("      Material Selection Chatbot           ")
@@ -35,16 +23,24 @@ def main():
             print("Goodbye!")
             break
 
-       
+        try:
+            backend.wait()
+        except Exception as e:
+            print(f"Error loading database: {e}")
+            return
+        nlp = backend.nlp
+        recommender = backend.recommender
+        render = backend.render
+
         constraints = nlp.process_query(user_input)
-        if not constraints:
+        # Free text is also matched against names, descriptions and applications
+        results = recommender.recommend(constraints, nlp.free_text(user_input))
+        if not constraints and not results:
             print("Bot: I couldn't detect specific material requirements. Try mentioning properties like strength, weight, cost, or corrosion resistance.")
             continue
         
-        print(f"   (Detected constraints: {constraints})")
-
-        
-        results = recommender.recommend(constraints)
+        if constraints:
+            print(f"   (Detected constraints: {constraints})")
 
        
         if results:
@@ -52,16 +48,8 @@ def main():
             mat = top_choice['material']
             print(f"\nBot: I recommend **{mat['name']}**.")
             print(f"     Type: {mat['type']}")
-            # Pretty print properties
-            print("     Properties:")
-            # Filter to show only relevant or all properties in a clean way
-            for k, v in mat['properties'].items():
-                if k in constraints:
-                    print(f"       * {k.ljust(25)} : {v} (Matched)")
-                else:
-                    # Optional: Don't show everything to avoid clutter, or show subset
-                    # For now show all but indented
-                    print(f"         {k.ljust(25)} : {v}")
+            # Pretty print properties (matched ones are marked)
+            print(render.properties_block(mat, constraints), end="")
 
             print(f"     Reason: {', '.join(top_choice['reasons'])}")
             print(f"     Description: {mat['description']}")
@@ -69,7 +57,7 @@ def main():
             if len(results) > 1:
                 print("\n     Alternatives:")
                 for alt in results[1:3]:
-                    print(f"     - {alt['material']['name']} (Score: {alt['score']})")
+                    print(f"     - {alt['material']['name']} (Score: {alt['score']:g})")
         else:
             print("\nBot: Sorry, I couldn't find a material that perfectly matches all those constraints. Try relaxing one requirement.")
         
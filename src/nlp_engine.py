@@ -68,6 +68,27 @@ class NLPEngine:
             }
         }
 
+        # Keywords longest first, so "high strength" is removed before "strong".
+        # Only whole words are removed, so "safety" keeps its "safe".
+        keywords = sorted(
+            {kw for values_map in self.property_map.values() for kws in values_map.values() for kw in kws},
+            key=len, reverse=True)
+        self._keyword_re = re.compile(r"\b(?:" + "|".join(map(re.escape, keywords)) + r")\b")
+        # Single words that only describe properties or levels, never a material
+        self._property_words = {word for prop in self.property_map for word in prop.split('_')}
+        self._property_words.update(level for values_map in self.property_map.values() for level in values_map)
+        self._property_words.update(["very", "resistant", "temperature"])
+
+    def free_text(self, query):
+        """
+        Returns the words of the query that are not property keywords or level
+        words, for full-text search. Those are already handled as constraints.
+        Example: 'high strength heat sink for aerospace' -> 'for aerospace'
+        """
+        text = self._keyword_re.sub(" ", query.lower())
+        words = [w for w in re.split(r"[^a-z0-9]+", text) if w and w not in self._property_words]
+        return " ".join(words)
+
     def process_query(self, query):
         """
         Analyzes the user query and returns a dictionary of extracted constraints.
@@ -1,67 +1,117 @@
+# properties where 'high' is generally better than 'medium' if 'medium' is requested
+# OR where 'very high' satisfies 'high'
+PERFORMANCE_PROPS = ['strength', 'stiffness', 'corrosion_resistance', 'hardness', 'ductility', 'max_temp', 'thermal_conductivity', 'electrical_conductivity']
+
+# Largest amount a single constraint can add to a material's score
+MAX_PROPERTY_SCORE = 2
+
+# Most points free-text relevance can add, reached at a BM25 score of TEXT_SCORE_CAP.
+# A single rare term fully matched in a material's name scores about 6.
+TEXT_WEIGHT = 2
+TEXT_SCORE_CAP = 10.0
+
 class Recommender:
     def __init__(self, database):
         self.db = database
 
-    def recommend(self, constraints):
+    def score_property(self, prop, required_val, mat_val):
+        """
+        Scores one constraint against a material's value.
+        Returns a tuple: (points, reason or None, mismatch)
+        """
+        # 1. Exact Match
+        if mat_val == required_val:
+            return 2, f"Matches {prop} ({mat_val})", False
+
+        # 2. "Better" than asked (e.g. asked for Medium, got High)
+        elif required_val == 'medium' and mat_val in ['high', 'very high'] and prop in PERFORMANCE_PROPS:
+            return 2, f"Exceeds {prop} requirement ({mat_val})", False  # Treat as full match or bonus
+
+        # 3. "Acceptable" fallback (e.g. asked for High, got Very High - handled above, but what about High vs Medium?)
+        # If asked for High, and got Medium --> Partial Score?
+        elif required_val in ['high', 'very high'] and mat_val == 'medium' and prop in PERFORMANCE_PROPS:
+            return 1, f"Acceptable {prop} ({mat_val})", False
+
+        # 4. Mismatch Checks (Critical failures)
+        # Cost: Wanted Low, got High
+        elif required_val == 'low' and mat_val in ['high', 'very high'] and prop == 'cost':
+            return 0, None, True
+        # Weight: Wanted Low, got High
+        elif required_val == 'low' and mat_val in ['high', 'very high'] and prop == 'weight':
+            return 0, None, True
+        # Performance: Wanted High, got Low (Critical for engineering)
+        elif required_val in ['high', 'very high'] and mat_val == 'low' and prop in PERFORMANCE_PROPS:
+            # Penalize heavily or mark mismatch
+            # Penalize but don't strictly filter out unless critical?
+            # Let's simple filter out if it directly contradicts the core request
+            # return 0, None, True # Stricter
+            return -2, None, False
+
+        return 0, None, False
+
+    def evaluate(self, mat, constraints):
+        """
+        Scores a single material against all constraints.
+        Returns a tuple: (score, reasons, mismatch)
+        """
+        score = 0
+        reasons = []
+        mismatch = False
+
+        for prop, required_val in constraints.items():
+            mat_val = mat['properties'].get(prop, 'unknown').lower()
+            points, reason, failed = self.score_property(prop, required_val, mat_val)
+            score += points
+            if reason:
+                reasons.append(reason)
+            if failed:
+                mismatch = True
+
+        return score, reasons, mismatch
+
+    def recommend(self, constraints, query=None):
         """
         Finds materials matching the constraints.
+        If free text is given, its relevance to each material's name,
+        description and applications is blended into the score. Pass only the
+        words not already turned into constraints (see NLPEngine.free_text).
         Returns a list of tuples: (material, score, reasons)
         """
         materials = self.db.get_all_materials()
         recommendations = []
 
-        # properties where 'high' is generally better than 'medium' if 'medium' is requested
-        # OR where 'very high' satisfies 'high'
-        performance_props = ['strength', 'stiffness', 'corrosion_resistance', 'hardness', 'ductility', 'max_temp', 'thermal_conductivity', 'electrical_conductivity']
-
-        for mat in materials:
-            score = 0
-            reasons = []
-            mismatch = False
-            
-            for prop, required_val in constraints.items():
-                mat_val = mat['properties'].get(prop, 'unknown').lower()
-                
-                # 1. Exact Match
-                if mat_val == required_val:
-                    score += 2
-                    reasons.append(f"Matches {prop} ({mat_val})")
-                
-                # 2. "Better" than asked (e.g. asked for Medium, got High)
-                elif required_val == 'medium' and mat_val in ['high', 'very high'] and prop in performance_props:
-                    score += 2  # Treat as full match or bonus
-                    reasons.append(f"Exceeds {prop} requirement ({mat_val})")
-                
-                # 3. "Acceptable" fallback (e.g. asked for High, got Very High - handled above, but what about High vs Medium?)
-                # If asked for High, and got Medium --> Partial Score?
-                elif required_val in ['high', 'very high'] and mat_val == 'medium' and prop in performance_props:
-                    score += 1
-                    reasons.append(f"Acceptable {prop} ({mat_val})")
-
-                # 4. Mismatch Checks (Critical failures)
-                # Cost: Wanted Low, got High
-                elif required_val == 'low' and mat_val in ['high', 'very high'] and prop == 'cost':
-                    mismatch = True
-                # Weight: Wanted Low, got High
-                elif required_val == 'low' and mat_val in ['high', 'very high'] and prop == 'weight':
-                    mismatch = True
-                # Performance: Wanted High, got Low (Critical for engineering)
-                elif required_val in ['high', 'very high'] and mat_val == 'low' and prop in performance_props:
-                   # Penalize heavily or mark mismatch
-                   score -= 2 # Penalize but don't strictly filter out unless critical?
-                   # Let's simple filter out if it directly contradicts the core request
-                   # mismatch = True # Stricter
-                   pass
-
-            if not mismatch:
-                # If we have at least one match or the score is decent
-                if score > 0:
-                    recommendations.append({
-                        "material": mat,
-                        "score": score,
-                        "reasons": reasons
-                    })
-        
+        text_scores = self.db.text_index.search(query) if query else {}
+
+        if constraints:
+            candidates = range(len(materials))
+        else:
+            # Without property constraints only text matches can score
+            candidates = sorted(text_scores)
+
+        for index in candidates:
+            mat = materials[index]
+            score, reasons, mismatch = self.evaluate(mat, constraints)
+
+            if mismatch:
+                continue
+            # Text relevance only adds to materials that meet the constraints
+            if constraints and score <= 0:
+                continue
+
+            score = float(score)
+            if index in text_scores:
+                relevance = min(1.0, text_scores[index] / TEXT_SCORE_CAP)
+                score = round(score + TEXT_WEIGHT * relevance, 2)
+                reasons.append(f"Text relevance ({relevance:.2f})")
+
+            # If we have at least one match or the score is decent
+            if score > 0:
+                recommendations.append({
+                    "material": mat,
+                    "score": score,
+                    "reasons": reasons
+                })
+
         # Sort by score descending
         recommendations.sort(key=lambda x: x['score'], reverse=True)
         return recommendations
@@ -0,0 +1,52 @@
+class RenderCache:
+    """
+    Precomputed text blocks for material output.
+    Blocks are built once per material and dropped whenever the database
+    is reloaded, so printing a material does no per-property formatting.
+    """
+
+    def __init__(self, database):
+        self.db = database
+        self._version = database.version
+        self._properties = {}
+        self._details = {}
+
+    def _check_version(self):
+        if self._version != self.db.version:
+            self.clear()
+            self._version = self.db.version
+
+    def clear(self):
+        self._properties.clear()
+        self._details.clear()
+
+    def properties_block(self, mat, constraints):
+        """
+        Returns the CLI property listing for a recommendation, marking the
+        properties that were part of the query.
+        """
+        self._check_version()
+        rows = self._properties.get(mat['id'])
+        if rows is None:
+            # (property, matched line, plain line), formatted once per material
+            rows = self._properties[mat['id']] = [
+                (k, f"       * {k.ljust(25)} : {v} (Matched)\n", f"         {k.ljust(25)} : {v}\n")
+                for k, v in mat['properties'].items()
+            ]
+        lines = ["     Properties:\n"]
+        lines.extend(matched if k in constraints else plain for k, matched, plain in rows)
+        return "".join(lines)
+
+    def detail_segments(self, mat):
+        """
+        Returns the detail panel contents as alternating (text, tags) items,
+        ready to be passed to a single Text.insert call.
+        """
+        self._check_version()
+        segments = self._details.get(mat['id'])
+        if segments is None:
+            body = [f"Type: {mat['type']}\n\n", "Properties:\n"]
+            body.extend(f"- {k}: {v}\n" for k, v in mat['properties'].items())
+            body.append(f"\nDesc: {mat['description']}\n")
+            segments = self._details[mat['id']] = (f"{mat['name']}\n", "bold", "".join(body), ())
+        return segments
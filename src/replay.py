@@ -0,0 +1,315 @@
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backend import Backend
+
+# Load-replay harness for the NLPEngine -> Recommender pipeline.
+#
+# Replays a JSONL query log (one object per line; the query text is taken from
+# "query", "body" or "title", in that order) either in-process or against a
+# local HTTP stand-in server, and prints a JSON summary of latency percentiles,
+# throughput and errors.
+#
+# Arrival models:
+#   closed  `concurrency` workers each send their next query as soon as the
+#           previous one finishes, optionally paced so the total rate stays at
+#           `rate` queries per second.
+#   open    queries arrive as a Poisson process at `rate` per second and are
+#           served by a pool of `concurrency` workers. Latency is measured from
+#           the scheduled arrival time, so queueing delay is included.
+#
+# Example:
+#   python src/replay.py requests.jsonl --mode open --rate 200 --concurrency 8 -n 2000
+#
+# --engine topk swaps in ThresholdRecommender so its touched counters can be
+# compared under load. It only scores property constraints: free-text
+# relevance is dropped, so its results can differ from the default engine.
+
+
+def load_queries(path):
+    """Reads the query texts from a JSONL log."""
+    queries = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            text = entry.get('query') or entry.get('body') or entry.get('title')
+            if text:
+                queries.append(text)
+    if not queries:
+        raise ValueError(f"No queries found in {path}")
+    return queries
+
+
+def run_pipeline(backend, query, topk=None):
+    """
+    Runs one query through the pipeline and returns the top results.
+    With a ThresholdRecommender only property constraints are used; free-text
+    relevance is not blended in.
+    """
+    constraints = backend.nlp.process_query(query)
+    if topk is not None:
+        results = topk.recommend(constraints, 3)
+    else:
+        results = backend.recommender.recommend(constraints, backend.nlp.free_text(query))
+    return {
+        "constraints": constraints,
+        "results": [{"name": r['material']['name'], "score": r['score']} for r in results[:3]],
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        if self.path != '/recommend':
+            self.send_error(404)
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            query = json.loads(self.rfile.read(length))['query']
+            body = json.dumps(run_pipeline(self.server.backend, query, self.server.topk)).encode('utf-8')
+        except Exception as e:
+            self.send_error(500, str(e))
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(backend, host='127.0.0.1', port=0, topk=None):
+    """Starts the HTTP stand-in on a background thread. Returns the server."""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.backend = backend
+    server.topk = topk
+    threading.Thread(target=server.serve_forever, name="replay-server", daemon=True).start()
+    return server
+
+
+def http_client(url, timeout=10.0):
+    """Returns a callable that sends one query to a /recommend endpoint."""
+    def send(query):
+        data = json.dumps({"query": query}).encode('utf-8')
+        req = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return json.loads(resp.read())
+    return send
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class _Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.errors = {}
+
+    def record(self, started, fn, query):
+        try:
+            fn(query)
+        except Exception as e:
+            with self.lock:
+                name = type(e).__name__
+                self.errors[name] = self.errors.get(name, 0) + 1
+            return
+        elapsed = time.perf_counter() - started
+        with self.lock:
+            self.latencies.append(elapsed)
+
+
+def replay_closed(fn, queries, total, concurrency, rate=None):
+    recorder = _Recorder()
+    counter = itertools.count()
+    counter_lock = threading.Lock()
+    # Each worker owns an equal share of the target rate
+    interval = concurrency / rate if rate else 0.0
+
+    def worker():
+        next_at = time.perf_counter()
+        while True:
+            with counter_lock:
+                i = next(counter)
+            if i >= total:
+                return
+            if interval:
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                next_at += interval
+            recorder.record(time.perf_counter(), fn, queries[i % len(queries)])
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return recorder, time.perf_counter() - start
+
+
+def replay_open(fn, queries, total, concurrency, rate, seed=None):
+    if not rate:
+        raise ValueError("Open-loop replay needs a target rate")
+    recorder = _Recorder()
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        arrival = start
+        for i in range(total):
+            arrival += rng.expovariate(rate)
+            delay = arrival - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(recorder.record, arrival, fn, queries[i % len(queries)])
+    return recorder, time.perf_counter() - start
+
+
+def summarize(recorder, elapsed, **config):
+    latencies = sorted(recorder.latencies)
+    errors = sum(recorder.errors.values())
+
+    def ms(value):
+        return None if value is None else round(value * 1000, 3)
+
+    return {
+        **config,
+        "completed": len(latencies),
+        "errors": errors,
+        "error_types": recorder.errors,
+        "duration_s": round(elapsed, 3),
+        "throughput_qps": round(len(latencies) / elapsed, 2) if elapsed > 0 else None,
+        "latency_ms": {
+            "p50": ms(percentile(latencies, 50)),
+            "p95": ms(percentile(latencies, 95)),
+            "p99": ms(percentile(latencies, 99)),
+            "mean": ms(sum(latencies) / len(latencies)) if latencies else None,
+            "max": ms(latencies[-1] if latencies else None),
+        },
+    }
+
+
+def _positive(cast):
+    """argparse type that only accepts values greater than zero."""
+    def convert(text):
+        try:
+            value = cast(text)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid {cast.__name__} value: {text!r}")
+        if value <= 0:
+            raise argparse.ArgumentTypeError(f"must be greater than zero, got {text}")
+        return value
+    return convert
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Replay a JSONL query log against the recommender.")
+    parser.add_argument('log', help="JSONL query log")
+    parser.add_argument('--mode', choices=['closed', 'open'], default='closed', help="arrival model")
+    parser.add_argument('--target', choices=['inprocess', 'http'], default='inprocess',
+                        help="call the pipeline directly or through the local HTTP stand-in")
+    parser.add_argument('--url', help="existing /recommend endpoint (implies --target http)")
+    parser.add_argument('--engine', choices=['scan', 'topk'], default='scan',
+                        help="scan: Recommender (with text relevance); topk: ThresholdRecommender, "
+                             "property constraints only, text relevance is dropped")
+    parser.add_argument('--rate', type=_positive(float), help="target queries per second")
+    parser.add_argument('--concurrency', type=_positive(int), default=1, help="number of concurrent workers")
+    parser.add_argument('-n', '--requests', type=_positive(int), help="queries to send (default: one pass over the log)")
+    parser.add_argument('--warmup', type=int, default=10, help="unmeasured queries sent first")
+    parser.add_argument('--seed', type=int, help="random seed for open-loop arrivals")
+    parser.add_argument('-o', '--output', help="write the summary here instead of stdout")
+    return parser
+
+
+def parse_args(parser, argv=None):
+    args = parser.parse_args(argv)
+    if args.mode == 'open' and args.rate is None:
+        parser.error("--mode open needs --rate")
+    if args.url and args.engine != 'scan':
+        parser.error("--engine only applies to the in-process pipeline or local stand-in, not --url")
+    return args
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parse_args(parser, argv)
+
+    queries = load_queries(args.log)
+    total = args.requests if args.requests is not None else len(queries)
+
+    server = None
+    topk = None
+    if args.url:
+        target = 'http'
+        fn = http_client(args.url)
+    else:
+        target = args.target
+        backend = Backend().wait()
+        if args.engine == 'topk':
+            from src.topk import ThresholdRecommender
+            topk = ThresholdRecommender(backend.db, backend.recommender)
+        if target == 'http':
+            server = start_server(backend, topk=topk)
+            fn = http_client(f"http://127.0.0.1:{server.server_address[1]}/recommend")
+        else:
+            fn = lambda query: run_pipeline(backend, query, topk)
+
+    try:
+        try:
+            for query in queries[:args.warmup]:
+                fn(query)
+        except Exception as e:
+            parser.exit(1, f"replay: warmup query failed, target unreachable or broken: {e}\n")
+
+        if args.mode == 'open':
+            recorder, elapsed = replay_open(fn, queries, total, args.concurrency, args.rate, args.seed)
+        else:
+            recorder, elapsed = replay_closed(fn, queries, total, args.concurrency, args.rate)
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    summary = summarize(recorder, elapsed, mode=args.mode, target=target, engine=args.engine,
+                        rate=args.rate, concurrency=args.concurrency, requests=total)
+    if topk is not None:
+        # Includes the warmup queries
+        summary["topk"] = {
+            "queries": topk.queries,
+            "total_touched": topk.total_touched,
+            "avg_touched": round(topk.total_touched / topk.queries, 2) if topk.queries else None,
+            "catalogue_size": len(backend.db.get_all_materials()),
+        }
+    text = json.dumps(summary, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return summary
+
+
+if __name__ == "__main__":
+    main()
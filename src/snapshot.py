@@ -0,0 +1,415 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from bisect import bisect_left
+from collections.abc import Mapping
+
+from src.text_index import TextIndex
+
+# Binary catalogue snapshot.
+#
+# Layout (all integers little-endian):
+#   header      MAGIC, version, material count, property count, string count,
+#               level count, then (offset, length) of every section below
+#   strings     uint32 offsets[string count + 1] followed by the UTF-8 blob
+#   props       uint32 string ids of the property names (column order)
+#   levels      uint32 string ids of the property values ("low", "high", ...)
+#   records     uint32[material count][8]: id, name, type, description,
+#               app start, app count, order start, order count
+#   apps        uint32 string ids of every material's applications
+#   order       uint8 property ids in each material's original key order
+#   matrix      uint8[material count][property count] level ids, MISSING if unset
+#   names       uint32 material rows sorted by lowercased name (name lookup)
+#   terms       uint32 string ids of the full-text terms, sorted
+#   term_index  uint32 offsets[term count + 1] into the postings arrays
+#   post_rows   uint32 material row of every posting
+#   post_tf     float32 field-weighted term frequency of every posting
+#   doc_lengths float32[material count] field-weighted document lengths
+#   text_meta   float64 average document length
+#
+# The last six sections are the TextIndex and name lookup precomputed at
+# build time, so opening a snapshot never has to scan the catalogue.
+#
+# Sections are 8-byte aligned so they can be exposed as memoryview casts
+# straight over the mmap without copying.
+
+MAGIC = b'MATSNAP\x00'
+VERSION = 2
+MISSING = 0xFF
+
+_SECTIONS = ('strings', 'props', 'levels', 'records', 'apps', 'order', 'matrix',
+             'names', 'terms', 'term_index', 'post_rows', 'post_tf', 'doc_lengths', 'text_meta')
+_HEADER = struct.Struct('<8s5I' + 'QQ' * len(_SECTIONS))
+_RECORD_FIELDS = 8
+
+
+def is_snapshot(path):
+    """Returns True if the file at path starts with the snapshot magic."""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def write_snapshot(materials, out_path):
+    """Serializes a list of material dicts into a snapshot file."""
+    strings = []
+    string_ids = {}
+
+    def intern(value):
+        value = str(value)
+        if value not in string_ids:
+            string_ids[value] = len(strings)
+            strings.append(value)
+        return string_ids[value]
+
+    prop_names = []
+    level_names = []
+    for mat in materials:
+        for k, v in mat['properties'].items():
+            if k not in prop_names:
+                prop_names.append(k)
+            if v not in level_names:
+                level_names.append(v)
+    if len(prop_names) >= MISSING or len(level_names) >= MISSING:
+        raise ValueError("Too many distinct properties or levels for a snapshot")
+
+    prop_index = {name: i for i, name in enumerate(prop_names)}
+    level_index = {name: i for i, name in enumerate(level_names)}
+
+    records = []
+    apps = []
+    order = bytearray()
+    matrix = bytearray([MISSING]) * (len(materials) * len(prop_names))
+    for row, mat in enumerate(materials):
+        app_start = len(apps)
+        apps.extend(intern(a) for a in mat.get('applications', []))
+        order_start = len(order)
+        for k, v in mat['properties'].items():
+            col = prop_index[k]
+            order.append(col)
+            matrix[row * len(prop_names) + col] = level_index[v]
+        records.extend([
+            intern(mat.get('id', '')), intern(mat['name']), intern(mat.get('type', '')),
+            intern(mat.get('description', '')),
+            app_start, len(apps) - app_start, order_start, len(order) - order_start,
+        ])
+
+    props = [intern(p) for p in prop_names]
+    levels = [intern(l) for l in level_names]
+
+    names = sorted(range(len(materials)), key=lambda row: (materials[row]['name'].lower(), row))
+
+    text_index = TextIndex(materials)
+    terms = sorted(text_index.postings)
+    term_index = [0]
+    post_rows = []
+    post_tf = []
+    for term in terms:
+        for row, tf in text_index.postings[term]:
+            post_rows.append(row)
+            post_tf.append(tf)
+        term_index.append(len(post_rows))
+    terms = [intern(t) for t in terms]
+
+    blob = bytearray()
+    offsets = [0]
+    for s in strings:
+        blob += s.encode('utf-8')
+        offsets.append(len(blob))
+
+    sections = {
+        'strings': struct.pack(f'<{len(offsets)}I', *offsets) + bytes(blob),
+        'props': struct.pack(f'<{len(props)}I', *props),
+        'levels': struct.pack(f'<{len(levels)}I', *levels),
+        'records': struct.pack(f'<{len(records)}I', *records),
+        'apps': struct.pack(f'<{len(apps)}I', *apps),
+        'order': bytes(order),
+        'matrix': bytes(matrix),
+        'names': struct.pack(f'<{len(names)}I', *names),
+        'terms': struct.pack(f'<{len(terms)}I', *terms),
+        'term_index': struct.pack(f'<{len(term_index)}I', *term_index),
+        'post_rows': struct.pack(f'<{len(post_rows)}I', *post_rows),
+        'post_tf': struct.pack(f'<{len(post_tf)}f', *post_tf),
+        'doc_lengths': struct.pack(f'<{len(materials)}f', *text_index.doc_lengths),
+        'text_meta': struct.pack('<d', text_index.avg_length),
+    }
+
+    body = bytearray()
+    layout = []
+    pos = _HEADER.size
+    for name in _SECTIONS:
+        pad = -pos % 8
+        body += b'\x00' * pad
+        pos += pad
+        layout.extend([pos, len(sections[name])])
+        body += sections[name]
+        pos += len(sections[name])
+
+    header = _HEADER.pack(MAGIC, VERSION, len(materials), len(prop_names),
+                          len(strings), len(level_names), *layout)
+
+    # Write to a temporary file and rename so readers never map a partial file
+    tmp_path = out_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(body)
+    os.replace(tmp_path, out_path)
+
+
+class Snapshot:
+    """Read-only view over a memory-mapped catalogue snapshot."""
+
+    def __init__(self, path):
+        if sys.byteorder != 'little':
+            raise ValueError("Snapshots can only be mapped on little-endian hosts")
+
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mm) < _HEADER.size:
+            self.close()
+            raise ValueError(f"Truncated snapshot file: {path}")
+        fields = _HEADER.unpack_from(self._mm, 0)
+        magic, version, self.material_count, self.property_count, string_count, level_count = fields[:6]
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"Not a material snapshot: {path}")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"Unsupported snapshot version {version} (expected {VERSION})")
+
+        layout = {}
+        for i, name in enumerate(_SECTIONS):
+            layout[name] = (fields[6 + 2 * i], fields[7 + 2 * i])
+        term_count = layout['terms'][1] // 4
+        posting_count = layout['post_rows'][1] // 4
+        # Expected byte size of each section (None: any length)
+        expected = {
+            'strings': None,
+            'props': 4 * self.property_count,
+            'levels': 4 * level_count,
+            'records': 4 * _RECORD_FIELDS * self.material_count,
+            'apps': None,
+            'order': None,
+            'matrix': self.material_count * self.property_count,
+            'names': 4 * self.material_count,
+            'terms': 4 * term_count,
+            'term_index': 4 * (term_count + 1),
+            'post_rows': 4 * posting_count,
+            'post_tf': 4 * posting_count,
+            'doc_lengths': 4 * self.material_count,
+            'text_meta': 8,
+        }
+        for name, (offset, length) in layout.items():
+            size = expected[name]
+            if offset + length > len(self._mm) or (size is not None and length != size) \
+                    or (name == 'apps' and length % 4) \
+                    or (name == 'strings' and length < 4 * (string_count + 1)):
+                self.close()
+                raise ValueError(f"Truncated snapshot: section '{name}' does not fit {path}")
+
+        view = memoryview(self._mm)
+        sections = {name: view[offset:offset + length] for name, (offset, length) in layout.items()}
+
+        strings = sections['strings']
+        self._string_offsets = strings[:4 * (string_count + 1)].cast('I')
+        self._string_blob = strings[4 * (string_count + 1):]
+        self._records = sections['records'].cast('I')
+        self._apps = sections['apps'].cast('I')
+        self._order = sections['order']
+        # Ordinal property matrix: matrix[row * property_count + col] is a level id
+        self.matrix = sections['matrix']
+        self._names = sections['names'].cast('I')
+        self._terms = sections['terms'].cast('I')
+        self._term_index = sections['term_index'].cast('I')
+        self._post_rows = sections['post_rows'].cast('I')
+        self._post_tf = sections['post_tf'].cast('f')
+        self.doc_lengths = sections['doc_lengths'].cast('f')
+        self.avg_length = sections['text_meta'].cast('d')[0]
+
+        self.property_names = [self.string(i) for i in sections['props'].cast('I')]
+        self.property_index = {name: col for col, name in enumerate(self.property_names)}
+        self.level_names = [self.string(i) for i in sections['levels'].cast('I')]
+
+    def string(self, string_id):
+        """Decodes an entry from the string table."""
+        start = self._string_offsets[string_id]
+        end = self._string_offsets[string_id + 1]
+        return str(self._string_blob[start:end], 'utf-8')
+
+    def level(self, row, col):
+        """Returns the level name of property col for material row, or None."""
+        level_id = self.matrix[row * self.property_count + col]
+        if level_id == MISSING:
+            return None
+        return self.level_names[level_id]
+
+    def record(self, row):
+        """Returns the raw record fields of material row."""
+        base = row * _RECORD_FIELDS
+        return self._records[base:base + _RECORD_FIELDS]
+
+    def find_name(self, name):
+        """Returns the first row whose name matches case-insensitively, or None."""
+        name = name.lower()
+        name_of = lambda row: self.string(self.record(row)[1]).lower()
+        pos = bisect_left(self._names, name, key=name_of)
+        if pos < len(self._names) and name_of(self._names[pos]) == name:
+            return self._names[pos]
+        return None
+
+    def postings(self, term):
+        """Returns [(row, tf), ...] for a full-text term, or [] if it is not indexed."""
+        pos = bisect_left(self._terms, term, key=self.string)
+        if pos == len(self._terms) or self.string(self._terms[pos]) != term:
+            return []
+        start, end = self._term_index[pos], self._term_index[pos + 1]
+        return list(zip(self._post_rows[start:end], self._post_tf[start:end]))
+
+    def close(self):
+        """Releases the views and unmaps the file."""
+        for attr in ('_string_offsets', '_string_blob', '_records', '_apps', '_order', 'matrix',
+                     '_names', '_terms', '_term_index', '_post_rows', '_post_tf', 'doc_lengths'):
+            view = self.__dict__.pop(attr, None)
+            if view is not None:
+                view.release()
+        self._mm.close()
+
+
+class SnapshotProperties(Mapping):
+    """
+    Properties of one material, read straight from the ordinal matrix.
+    Nothing is copied; each lookup is one byte read from the mapped file.
+    """
+
+    def __init__(self, snapshot, row):
+        self._snapshot = snapshot
+        self._row = row
+
+    def __getitem__(self, key):
+        col = self._snapshot.property_index.get(key)
+        value = None if col is None else self._snapshot.level(self._row, col)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self):
+        order_start, order_count = self._snapshot.record(self._row)[6:8]
+        for col in self._snapshot._order[order_start:order_start + order_count]:
+            yield self._snapshot.property_names[col]
+
+    def __len__(self):
+        return self._snapshot.record(self._row)[7]
+
+
+class SnapshotMaterial(Mapping):
+    """
+    One material with the same keys as a JSON catalogue entry.
+    Fields are decoded from the mapped file when read and never cached, so
+    every process shares the same page-cache pages instead of private copies.
+    """
+
+    _KEYS = ("id", "name", "type", "properties", "description", "applications")
+
+    def __init__(self, snapshot, row):
+        self._snapshot = snapshot
+        self._row = row
+
+    def __getitem__(self, key):
+        snapshot = self._snapshot
+        mat_id, name, mat_type, desc, app_start, app_count = snapshot.record(self._row)[:6]
+        if key == "id":
+            return snapshot.string(mat_id)
+        if key == "name":
+            return snapshot.string(name)
+        if key == "type":
+            return snapshot.string(mat_type)
+        if key == "description":
+            return snapshot.string(desc)
+        if key == "properties":
+            return SnapshotProperties(snapshot, self._row)
+        if key == "applications":
+            return [snapshot.string(a) for a in snapshot._apps[app_start:app_start + app_count]]
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self):
+        return len(self._KEYS)
+
+    def __repr__(self):
+        return f"SnapshotMaterial({self['name']!r})"
+
+
+class SnapshotMaterials:
+    """
+    Sequence of materials backed by a Snapshot.
+    Items are lightweight views over the mapped file, so opening the
+    catalogue costs the same regardless of its size.
+    """
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    def __len__(self):
+        return self.snapshot.material_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("material index out of range")
+        return SnapshotMaterial(self.snapshot, index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class _SnapshotPostings:
+    def __init__(self, snapshot):
+        self._snapshot = snapshot
+
+    def get(self, term, default=None):
+        return self._snapshot.postings(term) or default
+
+
+class SnapshotTextIndex(TextIndex):
+    """TextIndex whose postings are read from a snapshot instead of built."""
+
+    def __init__(self, snapshot, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = _SnapshotPostings(snapshot)
+        self.doc_lengths = snapshot.doc_lengths
+        self.doc_count = snapshot.material_count
+        self.avg_length = snapshot.avg_length
+
+
+def snapshot_path_for(json_path):
+    """Returns the snapshot path that sits next to a JSON catalogue."""
+    return os.path.splitext(json_path)[0] + '.snap'
+
+
+def build_snapshot(json_path, out_path=None):
+    """Build step: converts a JSON catalogue into a snapshot file."""
+    out_path = out_path or snapshot_path_for(json_path)
+    with open(json_path, 'r', encoding='utf-8') as f:
+        materials = json.load(f)
+    write_snapshot(materials, out_path)
+    return out_path
+
+
+if __name__ == "__main__":
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    src = sys.argv[1] if len(sys.argv) > 1 else os.path.join(base_dir, 'data', 'materials.json')
+    dst = sys.argv[2] if len(sys.argv) > 2 else None
+    print(f"Saved snapshot to {build_snapshot(src, dst)}")
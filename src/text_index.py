@@ -0,0 +1,84 @@
+import math
+import re
+
+# Words too common to say anything about a material
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "i", "in", "is",
+    "it", "need", "of", "on", "or", "something", "that", "the", "to", "want", "with",
+}
+
+# Relative importance of each searchable field
+FIELD_WEIGHTS = {
+    "name": 2.0,
+    "applications": 1.5,
+    "description": 1.0,
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+def tokenize(text):
+    """Lowercases text and splits it into index terms."""
+    terms = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        # Cheap plural folding so "implants" finds "implant"
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        terms.append(token)
+    return terms
+
+class TextIndex:
+    """
+    Inverted index over the name, description and applications of every
+    material, scored with BM25 using field-weighted term frequencies.
+    A search only reads the postings of the query's terms.
+    """
+
+    def __init__(self, materials, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = {}
+        self.doc_lengths = []
+        self._build(materials)
+
+    def _build(self, materials):
+        for index, mat in enumerate(materials):
+            fields = {
+                "name": mat.get('name', ''),
+                "description": mat.get('description', ''),
+                "applications": " ".join(mat.get('applications', [])),
+            }
+            freqs = {}
+            length = 0.0
+            for field, text in fields.items():
+                weight = FIELD_WEIGHTS[field]
+                for term in tokenize(text):
+                    freqs[term] = freqs.get(term, 0.0) + weight
+                    length += weight
+            for term, tf in freqs.items():
+                self.postings.setdefault(term, []).append((index, tf))
+            self.doc_lengths.append(length)
+
+        self.doc_count = len(self.doc_lengths)
+        self.avg_length = (sum(self.doc_lengths) / self.doc_count) if self.doc_count else 0.0
+
+    def idf(self, term):
+        df = len(self.postings.get(term, ()))
+        return math.log(1 + (self.doc_count - df + 0.5) / (df + 0.5))
+
+    def search(self, query):
+        """
+        Scores the materials that contain any query term.
+        Returns a dict: {material index: BM25 score}
+        """
+        scores = {}
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf(term)
+            for index, tf in postings:
+                norm = 1 - self.b + self.b * self.doc_lengths[index] / self.avg_length
+                scores[index] = scores.get(index, 0.0) + idf * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+        return scores
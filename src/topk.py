@@ -0,0 +1,126 @@
+import heapq
+import threading
+
+from src.recommender import Recommender
+
+# Sort key for constraints that rule a material out entirely
+_EXCLUDED = float('-inf')
+
+class ThresholdRecommender:
+    """
+    Top-k recommender using Fagin's Threshold Algorithm.
+
+    Keeps one ranked list per (property, required level), ordering every
+    material by the points that constraint would give it. A query walks its
+    lists in parallel, fully scoring each newly seen material, and stops as
+    soon as the k-th best score beats the sum of the points at the current
+    depth, since no unseen material can score higher than that.
+
+    Only property constraints are covered: results (and their order) are
+    identical to the first k entries of Recommender.recommend called without
+    free text. Text relevance is not blended in.
+    """
+
+    def __init__(self, database, recommender=None):
+        self.db = database
+        self.recommender = recommender or Recommender(database)
+        self._version = database.version
+        self._lists = {}
+        # Counters: materials fully scored by the last query and overall
+        # (materials ruled out by a mismatch in their ranked list are not scored)
+        self.last_touched = 0
+        self.total_touched = 0
+        self.queries = 0
+        self._counter_lock = threading.Lock()
+
+    def _ranked_list(self, prop, required_val):
+        """Returns [(points, index), ...] sorted best first, built on demand."""
+        if self._version != self.db.version:
+            self._lists.clear()
+            self._version = self.db.version
+
+        key = (prop, required_val)
+        ranked = self._lists.get(key)
+        if ranked is None:
+            # Points only depend on the material's value, so score each level once
+            by_value = {}
+            ranked = []
+            for index, mat in enumerate(self.db.get_all_materials()):
+                mat_val = mat['properties'].get(prop, 'unknown').lower()
+                points = by_value.get(mat_val)
+                if points is None:
+                    points, _, mismatch = self.recommender.score_property(prop, required_val, mat_val)
+                    points = by_value[mat_val] = _EXCLUDED if mismatch else points
+                ranked.append((points, index))
+            ranked.sort(key=lambda entry: (-entry[0], entry[1]))
+            self._lists[key] = ranked
+        return ranked
+
+    def recommend(self, constraints, k=3):
+        """
+        Returns the best k materials in the same shape as Recommender.recommend.
+        """
+        materials = self.db.get_all_materials()
+        if not constraints or k <= 0:
+            self._count(0)
+            return []
+
+        lists = [self._ranked_list(prop, val) for prop, val in constraints.items()]
+        seen = set()
+        touched = 0
+        # Min-heap of the best k so far, keyed so the worst entry is on top
+        best = []
+
+        for depth in range(len(materials)):
+            threshold = 0
+            for ranked in lists:
+                points, index = ranked[depth]
+                threshold += points
+                if index in seen:
+                    continue
+                seen.add(index)
+                # A mismatch on this constraint rules the material out already
+                if points == _EXCLUDED:
+                    continue
+
+                touched += 1
+                mat = materials[index]
+                score, reasons, mismatch = self.recommender.evaluate(mat, constraints)
+                if mismatch or score <= 0:
+                    continue
+                entry = (float(score), -index, reasons)
+                if len(best) < k:
+                    heapq.heappush(best, entry)
+                elif entry[:2] > best[0][:2]:
+                    heapq.heapreplace(best, entry)
+
+            # Unseen materials score at most `threshold`; only positive scores are kept
+            if threshold <= 0:
+                break
+            if len(best) == k and best[0][0] > threshold:
+                break
+
+        self._count(touched)
+
+        ordered = sorted(best, key=lambda entry: (-entry[0], -entry[1]))
+        return [
+            {"material": materials[-neg_index], "score": score, "reasons": reasons}
+            for score, neg_index, reasons in ordered
+        ]
+
+    def _count(self, touched):
+        # Queries may run on several threads (see replay.py --engine topk)
+        with self._counter_lock:
+            self.queries += 1
+            self.last_touched = touched
+            self.total_touched += touched
+
+    def cross_check(self, constraints, k=3):
+        """
+        Compares the top-k against the exhaustive scan.
+        Returns True when both give the same materials, scores and order.
+        """
+        expected = self.recommender.recommend(constraints)[:k]
+        actual = self.recommend(constraints, k)
+        return [(r['material']['id'], r['score']) for r in expected] == \
+            [(r['material']['id'], r['score']) for r in actual]
@@ -0,0 +1,38 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.database import MaterialDatabase
+from src.render import RenderCache
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'materials.json')
+
+
+def test_properties_block_marks_matched_properties():
+    db = MaterialDatabase(DATA_PATH)
+    render = RenderCache(db)
+    mat = db.materials[0]
+
+    block = render.properties_block(mat, {'strength': 'high'})
+    assert block.startswith("     Properties:\n")
+    assert f"       * {'strength'.ljust(25)} : high (Matched)\n" in block
+    assert f"         {'cost'.ljust(25)} : {mat['properties']['cost']}\n" in block
+    # Other constraint combinations reuse the same per-material entry
+    render.properties_block(mat, {'cost': 'low'})
+    render.properties_block(mat, {'cost': 'low', 'strength': 'high'})
+    assert len(render._properties) == 1
+
+
+def test_reload_clears_cache():
+    db = MaterialDatabase(DATA_PATH)
+    render = RenderCache(db)
+    mat = db.materials[0]
+    render.properties_block(mat, {})
+    render.detail_segments(mat)
+    assert render._properties and render._details
+
+    db.reload()
+    render.properties_block(db.materials[1], {})
+    assert list(render._properties) == [db.materials[1]['id']]
+    assert not render._details
@@ -0,0 +1,53 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.replay import _Recorder, build_parser, parse_args, percentile, summarize
+
+
+@pytest.mark.parametrize("argv", [
+    ['log.jsonl', '--mode', 'open'],
+    ['log.jsonl', '--mode', 'open', '--rate', '0'],
+    ['log.jsonl', '--mode', 'open', '--rate', '-5'],
+    ['log.jsonl', '--rate', '-5'],
+    ['log.jsonl', '--concurrency', '0'],
+    ['log.jsonl', '-n', '0'],
+    ['log.jsonl', '-n', 'many'],
+    ['log.jsonl', '--engine', 'topk', '--url', 'http://127.0.0.1:9/recommend'],
+])
+def test_invalid_arguments_are_rejected(argv):
+    with pytest.raises(SystemExit) as exc:
+        parse_args(build_parser(), argv)
+    assert exc.value.code == 2
+
+
+def test_valid_arguments():
+    args = parse_args(build_parser(), ['log.jsonl', '--mode', 'open', '--rate', '50', '--concurrency', '4', '-n', '10'])
+    assert (args.rate, args.concurrency, args.requests) == (50.0, 4, 10)
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([7], 99) == 7
+    assert percentile([], 50) is None
+
+
+def test_summarize():
+    recorder = _Recorder()
+    recorder.latencies = [0.001, 0.002, 0.003, 0.004]
+    recorder.errors = {'URLError': 1}
+    summary = summarize(recorder, 2.0, mode='closed')
+
+    assert summary['mode'] == 'closed'
+    assert summary['completed'] == 4
+    assert summary['errors'] == 1
+    assert summary['throughput_qps'] == 2.0
+    assert summary['latency_ms']['p50'] == 2.0
+    assert summary['latency_ms']['max'] == 4.0
+    assert summary['latency_ms']['mean'] == 2.5
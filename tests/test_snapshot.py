@@ -0,0 +1,88 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.database import MaterialDatabase, resolve_data_path
+from src.snapshot import snapshot_path_for, write_snapshot
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'materials.json')
+
+
+def load_catalogue():
+    with open(DATA_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_snapshot_round_trip(tmp_path):
+    materials = load_catalogue()
+    snap_path = str(tmp_path / 'materials.snap')
+    write_snapshot(materials, snap_path)
+
+    db = MaterialDatabase(snap_path)
+    try:
+        assert db.snapshot is not None
+        assert list(db.materials) == materials
+        # Property order is kept per material, not just the values
+        assert [list(m['properties']) for m in db.materials] == [list(m['properties']) for m in materials]
+        assert db.get_material_by_name(materials[-1]['name'])['id'] == materials[-1]['id']
+    finally:
+        db.snapshot.close()
+
+
+def test_snapshot_reload(tmp_path):
+    materials = load_catalogue()
+    snap_path = str(tmp_path / 'materials.snap')
+    write_snapshot(materials[:10], snap_path)
+
+    db = MaterialDatabase(snap_path)
+    old_snapshot = db.snapshot
+    write_snapshot(materials[:20], snap_path)
+    db.reload()
+    try:
+        assert db.version == 1
+        assert db.snapshot is not old_snapshot
+        assert old_snapshot._mm.closed
+        assert list(db.materials) == materials[:20]
+    finally:
+        db.snapshot.close()
+
+
+def test_truncated_snapshot_is_rejected(tmp_path):
+    materials = load_catalogue()
+    json_path = str(tmp_path / 'materials.json')
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(materials, f)
+    snap_path = snapshot_path_for(json_path)
+    write_snapshot(materials, snap_path)
+
+    with open(snap_path, 'rb') as f:
+        data = f.read()
+    for size in (len(data) // 2, len(data) - 100, 10):
+        with open(snap_path, 'wb') as f:
+            f.write(data[:size])
+        with pytest.raises(ValueError, match="Truncated snapshot"):
+            MaterialDatabase(snap_path)
+        # The entry points fall back to the JSON catalogue
+        assert resolve_data_path(json_path) == json_path
+
+
+def test_snapshot_carries_text_index_and_name_lookup(tmp_path):
+    materials = load_catalogue()
+    snap_path = str(tmp_path / 'materials.snap')
+    write_snapshot(materials, snap_path)
+
+    json_db = MaterialDatabase(DATA_PATH)
+    db = MaterialDatabase(snap_path)
+    try:
+        assert type(db.text_index).__name__ == 'SnapshotTextIndex'
+        for query in ("implant stent", "alloy", "carbon fiber epoxy", "unobtainium"):
+            assert db.text_index.search(query) == json_db.text_index.search(query)
+        for mat in materials[::25]:
+            assert db.get_material_by_name(mat['name'].upper())['id'] == mat['id']
+        assert db.get_material_by_name("Unobtainium") is None
+    finally:
+        db.snapshot.close()
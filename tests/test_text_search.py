@@ -0,0 +1,67 @@
+import json
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.database import MaterialDatabase
+from src.nlp_engine import NLPEngine
+from src.recommender import TEXT_WEIGHT, Recommender
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'materials.json')
+
+
+def run_query(recommender, nlp, query):
+    return recommender.recommend(nlp.process_query(query), nlp.free_text(query))
+
+
+def test_free_text_query_finds_named_materials():
+    db = MaterialDatabase(DATA_PATH)
+    results = run_query(Recommender(db), NLPEngine(), "implant stent")
+
+    names = [r['material']['name'] for r in results]
+    assert len(names) == 10
+    assert all(name.endswith(("Implant", "Stent")) for name in names)
+
+
+def test_property_words_are_not_scored_as_text():
+    db = MaterialDatabase(DATA_PATH)
+    recommender = Recommender(db)
+    nlp = NLPEngine()
+    query = "high strength, corrosion resistant"
+
+    with_text = run_query(recommender, nlp, query)
+    without_text = recommender.recommend(nlp.process_query(query))
+    assert [(r['material']['id'], r['score']) for r in with_text] == \
+        [(r['material']['id'], r['score']) for r in without_text]
+
+
+def test_free_text_keeps_whole_words():
+    nlp = NLPEngine()
+    assert nlp.free_text("safety glasses") == "safety glasses"
+    assert nlp.free_text("polycarbonate for lighting") == "polycarbonate for lighting"
+    assert nlp.free_text("software enclosure") == "software enclosure"
+    assert nlp.free_text("high strength heat sink for aerospace") == "for aerospace"
+
+
+def test_weak_text_match_earns_less_than_full_weight():
+    db = MaterialDatabase(DATA_PATH)
+    # "alloy" appears in dozens of names, so it says little about any one material
+    results = Recommender(db).recommend({}, "alloy")
+    assert results
+    assert all(0 < r['score'] < TEXT_WEIGHT for r in results)
+
+
+def test_reload_rebuilds_text_index(tmp_path):
+    with open(DATA_PATH, 'r', encoding='utf-8') as f:
+        materials = json.load(f)[:5]
+    json_path = tmp_path / 'materials.json'
+    json_path.write_text(json.dumps(materials), encoding='utf-8')
+
+    db = MaterialDatabase(str(json_path))
+    assert db.text_index.search("unobtainium") == {}
+
+    materials[0]['name'] = "Unobtainium"
+    json_path.write_text(json.dumps(materials), encoding='utf-8')
+    db.reload()
+    assert list(db.text_index.search("unobtainium")) == [0]
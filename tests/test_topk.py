@@ -0,0 +1,41 @@
+import os
+import random
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.database import MaterialDatabase
+from src.nlp_engine import NLPEngine
+from src.recommender import Recommender
+from src.topk import ThresholdRecommender
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'materials.json')
+
+
+def test_threshold_matches_exhaustive_scan():
+    db = MaterialDatabase(DATA_PATH)
+    recommender = Recommender(db)
+    topk = ThresholdRecommender(db, recommender)
+
+    levels = {prop: list(values) + ['medium', 'very high'] for prop, values in NLPEngine().property_map.items()}
+    rng = random.Random(0)
+    for _ in range(300):
+        props = rng.sample(sorted(levels), rng.randint(1, 5))
+        constraints = {prop: rng.choice(levels[prop]) for prop in props}
+        for k in (1, 3, 10):
+            assert topk.cross_check(constraints, k), (constraints, k)
+
+
+def test_threshold_terminates_early():
+    db = MaterialDatabase(DATA_PATH)
+    topk = ThresholdRecommender(db)
+    catalogue_size = len(db.materials)
+
+    topk.recommend({'strength': 'high', 'weight': 'low'}, 3)
+    assert 0 < topk.last_touched < catalogue_size
+
+    topk.recommend({'cost': 'low', 'corrosion_resistance': 'excellent'}, 3)
+    assert 0 < topk.last_touched < catalogue_size
+
+    assert topk.queries == 2
+    assert topk.total_touched < topk.queries * catalogue_size